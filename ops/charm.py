@@ -1,51 +1,61 @@
+import os
+import pickle
+import re
+import weakref
+
+import yaml
+
 from ops.framework import Object, EventSource, EventBase, EventsBase
 
 
 class HookEvent(EventBase):
-    pass
+    __slots__ = ()
 
 
 class InstallEvent(HookEvent):
-    pass
+    __slots__ = ()
 
 
 class StartEvent(HookEvent):
-    pass
+    __slots__ = ()
 
 
 class StopEvent(HookEvent):
-    pass
+    __slots__ = ()
 
 
 class ConfigChangedEvent(HookEvent):
-    pass
+    __slots__ = ()
 
 
 class UpdateStatusEvent(HookEvent):
-    pass
+    __slots__ = ()
 
 
 class UpgradeCharmEvent(HookEvent):
-    pass
+    __slots__ = ()
 
 
 class PreSeriesUpgradeEvent(HookEvent):
-    pass
+    __slots__ = ()
 
 
 class PostSeriesUpgradeEvent(HookEvent):
-    pass
+    __slots__ = ()
 
 
 class LeaderElectedEvent(HookEvent):
-    pass
+    __slots__ = ()
 
 
 class LeaderSettingsChangedEvent(HookEvent):
-    pass
+    __slots__ = ()
 
 
 class RelationEvent(HookEvent):
+
+    __slots__ = ('relation', 'app', 'unit')
+
     def __init__(self, handle, relation, app=None, unit=None):
         super().__init__(handle)
 
@@ -84,31 +94,44 @@ class RelationEvent(HookEvent):
 
 
 class RelationJoinedEvent(RelationEvent):
-    pass
+    __slots__ = ()
 
 
 class RelationChangedEvent(RelationEvent):
-    pass
+    __slots__ = ()
 
 
 class RelationDepartedEvent(RelationEvent):
-    pass
+    __slots__ = ()
 
 
 class RelationBrokenEvent(RelationEvent):
-    pass
+    __slots__ = ()
 
 
 class StorageEvent(HookEvent):
-    pass
+    __slots__ = ()
 
 
 class StorageAttachedEvent(StorageEvent):
-    pass
+    __slots__ = ()
 
 
 class StorageDetachingEvent(StorageEvent):
-    pass
+    __slots__ = ()
+
+
+_RELATION_EVENT_SUFFIXES = (
+    ('_relation_joined', RelationJoinedEvent),
+    ('_relation_changed', RelationChangedEvent),
+    ('_relation_departed', RelationDepartedEvent),
+    ('_relation_broken', RelationBrokenEvent),
+)
+
+_STORAGE_EVENT_SUFFIXES = (
+    ('_storage_attached', StorageAttachedEvent),
+    ('_storage_detaching', StorageDetachingEvent),
+)
 
 
 class CharmEvents(EventsBase):
@@ -125,24 +148,53 @@ class CharmEvents(EventsBase):
     leader_settings_changed = EventSource(LeaderSettingsChangedEvent)
 
 
+def _define_meta_events(events_type, meta):
+    """Return a subclass of events_type with the relation and storage events for meta defined."""
+    # Relation and storage events depend on the metadata, so define them on a
+    # subclass rather than mutating the shared events type.
+    meta_events_type = type(f'{events_type.__name__}WithMetaEvents', (events_type,), {})
+    define_event = meta_events_type.define_event
+
+    for relation_name in meta.relations:
+        relation_name = relation_name.replace('-', '_')
+        for suffix, event_type in _RELATION_EVENT_SUFFIXES:
+            define_event(relation_name + suffix, event_type)
+
+    for storage_name in meta.storages:
+        storage_name = storage_name.replace('-', '_')
+        for suffix, event_type in _STORAGE_EVENT_SUFFIXES:
+            define_event(storage_name + suffix, event_type)
+
+    return meta_events_type
+
+
 class CharmBase(Object):
 
     on = CharmEvents()
 
+    # {meta: {events_type: meta_events_type}}, so the events for a given metadata are defined once.
+    _meta_events_types = weakref.WeakKeyDictionary()
+
     def __init__(self, framework, key):
         super().__init__(framework, key)
 
-        for relation_name in self.framework.meta.relations:
-            relation_name = relation_name.replace('-', '_')
-            self.on.define_event(f'{relation_name}_relation_joined', RelationJoinedEvent)
-            self.on.define_event(f'{relation_name}_relation_changed', RelationChangedEvent)
-            self.on.define_event(f'{relation_name}_relation_departed', RelationDepartedEvent)
-            self.on.define_event(f'{relation_name}_relation_broken', RelationBrokenEvent)
+        # Bind a single events object to the instance so that self.on doesn't build
+        # a new one on every access. Relation and storage events only exist on it.
+        events_type = type(type(self).on)
+        meta = self.framework.meta
+        if meta.relations or meta.storages:
+            meta_events_types = CharmBase._meta_events_types.setdefault(meta, {})
+            meta_events_type = meta_events_types.get(events_type)
+            if meta_events_type is None:
+                meta_events_type = _define_meta_events(events_type, meta)
+                meta_events_types[events_type] = meta_events_type
+            events_type = meta_events_type
+        self.on = events_type(self)
+
 
-        for storage_name in self.framework.meta.storages:
-            storage_name = storage_name.replace('-', '_')
-            self.on.define_event(f'{storage_name}_storage_attached', StorageAttachedEvent)
-            self.on.define_event(f'{storage_name}_storage_detaching', StorageDetachingEvent)
+# Version of the pickled CharmMeta layout stored by CharmMeta.from_yaml. Bump it whenever
+# the attributes of CharmMeta or of the *Meta classes change, so stale caches are ignored.
+_METADATA_CACHE_VERSION = 2
 
 
 class CharmMeta:
@@ -158,43 +210,90 @@ class CharmMeta:
     the relation definition can be obtained from its role attribute.
     """
 
+    __slots__ = ('name', 'summary', 'description', 'maintainers', 'tags', 'terms', 'series',
+                 'subordinate', 'min_juju_version', 'requires', 'provides', 'peers', 'relations',
+                 'storages', 'resources', 'payloads', 'extra_bindings', '__weakref__')
+
     def __init__(self, raw=None):
         raw = raw or {}
         self.name = raw.get('name', '')
         self.summary = raw.get('summary', '')
         self.description = raw.get('description', '')
         self.maintainers = []
-        if 'maintainer' in raw:
-            self.maintainers.append(raw['maintainer'])
-        if 'maintainers' in raw:
-            self.maintainers.extend(raw['maintainers'])
+        maintainer = raw.get('maintainer')
+        if maintainer is not None:
+            self.maintainers.append(maintainer)
+        maintainers = raw.get('maintainers')
+        if maintainers is not None:
+            self.maintainers.extend(maintainers)
         self.tags = raw.get('tags', [])
         self.terms = raw.get('terms', [])
         self.series = raw.get('series', [])
         self.subordinate = raw.get('subordinate', False)
         self.min_juju_version = raw.get('min-juju-version')
-        self.requires = {name: RelationMeta('requires', name, rel)
-                         for name, rel in raw.get('requires', {}).items()}
-        self.provides = {name: RelationMeta('provides', name, rel)
-                         for name, rel in raw.get('provides', {}).items()}
-        self.peers = {name: RelationMeta('peers', name, rel)
-                      for name, rel in raw.get('peers', {}).items()}
-        self.relations = {}
-        self.relations.update(self.requires)
-        self.relations.update(self.provides)
-        self.relations.update(self.peers)
-        self.storages = {name: StorageMeta(name, storage)
-                         for name, storage in raw.get('storage', {}).items()}
-        self.resources = {name: ResourceMeta(name, res)
-                          for name, res in raw.get('resources', {}).items()}
-        self.payloads = {name: PayloadMeta(name, payload)
-                         for name, payload in raw.get('payloads', {}).items()}
+        self.requires = _build_relation_metas(raw, 'requires')
+        self.provides = _build_relation_metas(raw, 'provides')
+        self.peers = _build_relation_metas(raw, 'peers')
+        self.relations = {**self.requires, **self.provides, **self.peers}
+        self.storages = _build_metas(raw, 'storage', StorageMeta)
+        self.resources = _build_metas(raw, 'resources', ResourceMeta)
+        self.payloads = _build_metas(raw, 'payloads', PayloadMeta)
         self.extra_bindings = raw.get('extra-bindings', [])
 
+    @classmethod
+    def from_yaml(cls, path, cache_path=None):
+        """Load the charm metadata from the YAML file at path.
+
+        If cache_path is provided, the parsed metadata is pickled there and reused
+        by later calls for as long as the cache format version and the path,
+        modification time, and size of the YAML file remain the same. A missing,
+        stale, or unreadable cache is ignored and rebuilt from the YAML file.
+        """
+        st = os.stat(path)
+        cache_key = (_METADATA_CACHE_VERSION, str(path), st.st_mtime_ns, st.st_size)
+        if cache_path is not None:
+            # The key is pickled on its own ahead of the metadata, so a stale cache is
+            # detected without unpickling objects whose classes may no longer exist.
+            # Any failure to read the cache is treated as a miss.
+            try:
+                with open(cache_path, 'rb') as f:
+                    if pickle.load(f) == cache_key:
+                        meta = pickle.load(f)
+                        if isinstance(meta, cls):
+                            return meta
+            except Exception:
+                pass
+
+        with open(path) as f:
+            meta = cls(yaml.load(f, Loader=yaml.SafeLoader))
+
+        if cache_path is not None:
+            tmp_path = f'{cache_path}.tmp'
+            try:
+                with open(tmp_path, 'wb') as f:
+                    pickle.dump(cache_key, f, pickle.HIGHEST_PROTOCOL)
+                    pickle.dump(meta, f, pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, cache_path)
+            except OSError:
+                pass
+        return meta
+
+
+def _build_metas(raw, key, meta_type):
+    """Return a mapping of names to meta_type instances for the raw[key] section."""
+    return {name: meta_type(name, item) for name, item in raw.get(key, {}).items()}
+
+
+def _build_relation_metas(raw, role):
+    """Return a mapping of relation names to RelationMeta instances for the given role."""
+    return {name: RelationMeta(role, name, rel) for name, rel in raw.get(role, {}).items()}
+
 
 class RelationMeta:
     """Object containing metadata about a relation definition."""
 
+    __slots__ = ('role', 'relation_name', 'interface_name', 'scope')
+
     def __init__(self, role, relation_name, raw):
         self.role = role
         self.relation_name = relation_name
@@ -202,9 +301,15 @@ class RelationMeta:
         self.scope = raw.get('scope')
 
 
+_STORAGE_RANGE_RE = re.compile(r'\d+(-\d*)?')
+
+
 class StorageMeta:
     """Object containing metadata about a storage definition."""
 
+    __slots__ = ('storage_name', 'type', 'description', 'shared', 'read_only', 'minimum_size',
+                 'location', '_raw_multiple', '_multiple_range')
+
     def __init__(self, name, raw):
         self.storage_name = name
         self.type = raw['type']
@@ -213,19 +318,38 @@ class StorageMeta:
         self.read_only = raw.get('read-only', False)
         self.minimum_size = raw.get('minimum-size')
         self.location = raw.get('location')
-        self.multiple_range = None
-        if 'multiple' in raw:
-            range = raw['multiple']['range']
-            if '-' not in range:
-                self.multiple_range = (int(range), int(range))
+        self._raw_multiple = None
+        self._multiple_range = None
+        multiple = raw.get('multiple')
+        if multiple is not None:
+            # Validate the range up front; only the conversion to integers is deferred.
+            range = multiple['range']
+            if not isinstance(range, str) or not _STORAGE_RANGE_RE.fullmatch(range):
+                raise ValueError(f'invalid multiple range for storage {name}: {range!r}')
+            self._raw_multiple = range
+
+    @property
+    def multiple_range(self):
+        """The (minimum, maximum) number of instances, or None if multiple is not set.
+
+        The maximum is None if the range is open-ended. The range is validated when the
+        metadata is loaded, and converted on first access.
+        """
+        if self._raw_multiple is not None:
+            minimum, sep, maximum = self._raw_multiple.partition('-')
+            if not sep:
+                self._multiple_range = (int(minimum), int(minimum))
             else:
-                range = range.split('-')
-                self.multiple_range = (int(range[0]), int(range[1]) if range[1] else None)
+                self._multiple_range = (int(minimum), int(maximum) if maximum else None)
+            self._raw_multiple = None
+        return self._multiple_range
 
 
 class ResourceMeta:
     """Object containing metadata about a resource definition."""
 
+    __slots__ = ('resource_name', 'type', 'filename', 'description')
+
     def __init__(self, name, raw):
         self.resource_name = name
         self.type = raw['type']
@@ -236,6 +360,8 @@ class ResourceMeta:
 class PayloadMeta:
     """Object containing metadata about a payload definition."""
 
+    __slots__ = ('payload_name', 'type')
+
     def __init__(self, name, raw):
         self.payload_name = name
         self.type = raw['type']
@@ -90,6 +90,9 @@ class Handle:
 
 class EventBase:
 
+    # Subclasses that don't declare __slots__ themselves still get a __dict__ as usual.
+    __slots__ = ('handle', 'deferred', 'framework', '__weakref__')
+
     def __init__(self, handle):
         self.handle = handle
         self.deferred = False
@@ -186,6 +189,23 @@ class HandleKind:
         return obj_type.__name__
 
 
+# {type: {event_kind: event_source}}, cleared whenever EventsBase.define_event changes a type.
+_event_sources_cache = weakref.WeakKeyDictionary()
+
+
+def _event_sources(obj_type):
+    """Return a read-only mapping of event_kinds to EventSource descriptors defined on obj_type.
+
+    The mapping is computed once per type and shared by all callers.
+    """
+    sources = _event_sources_cache.get(obj_type)
+    if sources is None:
+        sources = types.MappingProxyType({attr_name: attr_value for attr_name, attr_value in inspect.getmembers(obj_type)
+                                          if isinstance(attr_value, EventSource)})
+        _event_sources_cache[obj_type] = sources
+    return sources
+
+
 class Object:
 
     handle_kind = HandleKind()
@@ -203,12 +223,8 @@ class Object:
         # TODO This can probably be dropped, because the event type is only
         # really relevant if someone is either emitting the event or observing
         # it.
-        for attr_name, attr_value in inspect.getmembers(type(self)):
-            if isinstance(attr_value, EventSource):
-                event_type = attr_value.event_type
-                event_kind = attr_name
-                emitter = self
-                self.framework.register_type(event_type, emitter, event_kind)
+        for event_kind, event_source in _event_sources(type(self)).items():
+            self.framework.register_type(event_source.event_type, self, event_kind)
 
         # TODO Detect conflicting handles here.
 
@@ -250,21 +266,17 @@ class EventsBase(Object):
         event_descriptor = EventSource(event_type)
         event_descriptor.__set_name__(cls, event_kind)
         setattr(cls, event_kind, event_descriptor)
+        # Subclasses inherit the new event as well, so drop every cached entry.
+        _event_sources_cache.clear()
 
     def events(self):
         """Return a mapping of event_kinds to bound_events for all available events.
         """
-        events_map = {}
         # We have to iterate over the class rather than instance to allow for properties which
         # might call this method (e.g., event views), leading to infinite recursion.
-        for attr_name, attr_value in inspect.getmembers(type(self)):
-            if isinstance(attr_value, EventSource):
-                # We actually care about the bound_event, however, since it
-                # provides the most info for users of this method.
-                event_kind = attr_name
-                bound_event = getattr(self, event_kind)
-                events_map[event_kind] = bound_event
-        return events_map
+        # We actually care about the bound_event, however, since it
+        # provides the most info for users of this method.
+        return {event_kind: getattr(self, event_kind) for event_kind in _event_sources(type(self))}
 
     def __getitem__(self, key):
         return PrefixedEvents(self, key)
@@ -272,6 +284,8 @@ class EventsBase(Object):
 
 class PrefixedEvents:
 
+    __slots__ = ('_emitter', '_prefix')
+
     def __init__(self, emitter, key):
         self._emitter = emitter
         self._prefix = key.replace("-", "_") + '_'
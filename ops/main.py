@@ -4,13 +4,12 @@ import os
 import sys
 from pathlib import Path
 
-import yaml
-
 import ops.charm
 import ops.framework
 import ops.model
 
 CHARM_STATE_FILE = '.unit-state.db'
+CHARM_METADATA_CACHE_FILE = '.metadata.cache'
 
 
 def debugf(format, *args, **kwargs):
@@ -27,12 +26,6 @@ def _get_charm_dir():
     return charm_dir
 
 
-def _load_metadata(charm_dir):
-    with open(charm_dir / 'metadata.yaml') as f:
-        metadata = yaml.load(f, Loader=yaml.SafeLoader)
-    return metadata
-
-
 def _create_event_link(charm_dir, event_dir, target_path, bound_event):
     """Create a symlink for a particular event.
 
@@ -103,7 +96,7 @@ def _get_event_args(charm, bound_event):
 
     if issubclass(event_type, ops.charm.RelationEvent):
         relation_name = os.environ['JUJU_RELATION']
-        relation_id = int(os.environ['JUJU_RELATION_ID'].split(':')[-1])
+        relation_id = int(os.environ['JUJU_RELATION_ID'].rpartition(':')[2])
         relation = model.get_relation(relation_name, relation_id)
     else:
         relation = None
@@ -112,9 +105,9 @@ def _get_event_args(charm, bound_event):
     remote_unit_name = os.environ.get('JUJU_REMOTE_UNIT', '')
     if remote_app_name or remote_unit_name:
         if not remote_app_name:
-            if '/' not in remote_unit_name:
+            remote_app_name, sep, _ = remote_unit_name.partition('/')
+            if not sep:
                 raise RuntimeError(f'invalid remote unit name: {remote_unit_name}')
-            remote_app_name = remote_unit_name.split('/')[0]
         args = [relation, model.get_app(remote_app_name)]
         if remote_unit_name:
             args.append(model.get_unit(remote_unit_name))
@@ -138,7 +131,7 @@ def main(charm_class):
     # TODO: For Windows, when symlinks are used, this is not a valid method of getting an event name (see LP: #1854505).
     juju_event_name = Path(sys.argv[0]).name
 
-    meta = ops.charm.CharmMeta(_load_metadata(charm_dir))
+    meta = ops.charm.CharmMeta.from_yaml(charm_dir / 'metadata.yaml', charm_dir / CHARM_METADATA_CACHE_FILE)
     unit_name = os.environ['JUJU_UNIT_NAME']
     model = ops.model.Model(unit_name, meta, ops.model.ModelBackend())
 
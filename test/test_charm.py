@@ -1,11 +1,13 @@
 #!/usr/bin/python3
 
 import os
+import pickle
 import unittest
 import tempfile
 import shutil
 
 from pathlib import Path
+from unittest.mock import patch
 
 from ops.charm import CharmBase, CharmMeta
 from ops.charm import CharmEvents
@@ -31,8 +33,7 @@ class TestCharm(unittest.TestCase):
         class TestCharmEvents(CharmEvents):
             custom = EventSource(CustomEvent)
 
-        # Relations events are defined dynamically and modify the class attributes.
-        # We use a subclass temporarily to prevent these side effects from leaking.
+        # Use events with an extra custom event for the duration of each test.
         CharmBase.on = TestCharmEvents()
 
         def cleanup():
@@ -69,6 +70,9 @@ class TestCharm(unittest.TestCase):
         charm.on.start.emit()
 
         self.assertEqual(charm.started, True)
+        # The events object is bound once, even without relations or storage.
+        self.assertIs(charm.on, charm.on)
+        self.assertIsInstance(charm.on, type(CharmBase.on))
 
     def test_relation_events(self):
 
@@ -126,6 +130,31 @@ class TestCharm(unittest.TestCase):
             'RelationBrokenEvent',
         ])
 
+    def test_relation_events_defined_per_meta(self):
+        self.meta = CharmMeta({
+            'name': 'my-charm',
+            'requires': {
+                'req1': {'interface': 'req1'},
+            },
+        })
+        framework = self.create_framework()
+
+        charm1 = CharmBase(framework, '1')
+        charm2 = CharmBase(framework, '2')
+
+        self.assertIn('req1_relation_joined', charm1.on.events())
+        self.assertIn('req1_relation_joined', charm2.on.events())
+        # Events for the same metadata are only defined once.
+        self.assertIs(type(charm1.on), type(charm2.on))
+        self.assertIs(charm1.on, charm1.on)
+        # The derived type is distinguishable from the type it extends.
+        self.assertIsInstance(charm1.on, type(CharmBase.on))
+        self.assertIsNot(type(charm1.on), type(CharmBase.on))
+        self.assertNotEqual(type(charm1.on).__qualname__, type(CharmBase.on).__qualname__)
+        self.assertEqual(charm1.on.handle.kind, 'on')
+        # The shared events type is left untouched, so relation events are only listed on instances.
+        self.assertNotIn('req1_relation_joined', CharmBase.on.events())
+
     def test_storage_events(self):
 
         class MyCharm(CharmBase):
@@ -174,11 +203,27 @@ class TestCharm(unittest.TestCase):
             },
         })
 
+        # Ranges survive pickling before and after they are first read.
+        storages = pickle.loads(pickle.dumps(self.meta.storages))
+        for _ in range(2):
+            self.assertIsNone(storages['stor1'].multiple_range)
+            self.assertEqual(storages['stor2'].multiple_range, (2, 2))
+            self.assertEqual(storages['stor3'].multiple_range, (2, None))
+            self.assertEqual(storages['stor-4'].multiple_range, (2, 4))
+            storages = pickle.loads(pickle.dumps(storages))
+
         self.assertIsNone(self.meta.storages['stor1'].multiple_range)
         self.assertEqual(self.meta.storages['stor2'].multiple_range, (2, 2))
         self.assertEqual(self.meta.storages['stor3'].multiple_range, (2, None))
         self.assertEqual(self.meta.storages['stor-4'].multiple_range, (2, 4))
 
+        # Malformed ranges are still rejected when the metadata is loaded.
+        for multiple in ({'range': 'abc'}, {'range': '2-x'}, {'range': 2}):
+            with self.assertRaises(ValueError):
+                CharmMeta({'storage': {'stor': {'type': 'filesystem', 'multiple': multiple}}})
+        with self.assertRaises(KeyError):
+            CharmMeta({'storage': {'stor': {'type': 'filesystem', 'multiple': {}}}})
+
         charm = MyCharm(self.create_framework(), None)
 
         charm.on['stor1'].storage_attached.emit()
@@ -193,6 +238,48 @@ class TestCharm(unittest.TestCase):
             'StorageAttachedEvent',
         ])
 
+    def test_meta_from_yaml(self):
+        meta_path = self.tmpdir / 'metadata.yaml'
+        cache_path = self.tmpdir / '.metadata.cache'
+        meta_path.write_text('name: my-charm\nrequires:\n  db:\n    interface: db\n')
+
+        meta = CharmMeta.from_yaml(meta_path, cache_path)
+        self.assertEqual(meta.name, 'my-charm')
+        self.assertEqual(list(meta.relations), ['db'])
+        self.assertTrue(cache_path.exists())
+
+        # An unchanged file is served from the cache without parsing the YAML again.
+        with patch('ops.charm.yaml.load', side_effect=AssertionError('metadata.yaml was parsed')) as load:
+            cached = CharmMeta.from_yaml(meta_path, cache_path)
+        load.assert_not_called()
+        self.assertEqual(cached.name, 'my-charm')
+        self.assertEqual(cached.relations['db'].interface_name, 'db')
+
+        # A cache written under a different key is ignored even if it is otherwise valid.
+        with open(cache_path, 'rb') as f:
+            key = pickle.load(f)
+        for stale_key in ((key[0] + 1,) + key[1:], key[:-1] + (key[-1] + 1,)):
+            cache_path.write_bytes(pickle.dumps(stale_key) + pickle.dumps(CharmMeta({'name': 'stale'})))
+            self.assertEqual(CharmMeta.from_yaml(meta_path, cache_path).name, 'my-charm')
+
+        # A cache referencing a module that no longer exists is ignored as well.
+        cache_path.write_bytes(pickle.dumps(key) + b'cno_such_module\nNoSuchMeta\n.')
+        with self.assertRaises(ModuleNotFoundError):
+            pickle.loads(cache_path.read_bytes()[len(pickle.dumps(key)):])
+        self.assertEqual(CharmMeta.from_yaml(meta_path, cache_path).name, 'my-charm')
+
+        # A modified file invalidates the cache.
+        meta_path.write_text('name: my-other-charm\n')
+        meta = CharmMeta.from_yaml(meta_path, cache_path)
+        self.assertEqual(meta.name, 'my-other-charm')
+        self.assertEqual(meta.relations, {})
+
+        # A corrupt cache is ignored and rebuilt.
+        cache_path.write_bytes(b'garbage')
+        meta = CharmMeta.from_yaml(meta_path, cache_path)
+        self.assertEqual(meta.name, 'my-other-charm')
+        self.assertEqual(CharmMeta.from_yaml(meta_path, cache_path).name, 'my-other-charm')
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -620,9 +620,15 @@ class TestFramework(unittest.TestCase):
         class NoneEvent(EventBase):
             pass
 
+        self.assertEqual(list(pub.on_a.events()), [])
+
         pub.on_a.define_event("foo", MyFoo)
         pub.on_b.define_event("bar", MyBar)
 
+        # Events defined at runtime are visible even after the listing was cached.
+        self.assertEqual(list(pub.on_a.events()), ["foo"])
+        self.assertEqual(list(pub.on_b.events()), ["bar"])
+
         framework.observe(pub.on_a.foo, obs)
         framework.observe(pub.on_b.bar, obs)
 
@@ -15,8 +15,6 @@ import importlib.util
 from pathlib import Path
 
 from ops.charm import (
-    CharmBase,
-    CharmEvents,
     HookEvent,
     InstallEvent,
     StartEvent,
@@ -62,16 +60,7 @@ class TestMain(unittest.TestCase):
         self._state_file = Path(tmp_file)
         self.addCleanup(self._state_file.unlink)
 
-        # Relations events are defined dynamically and modify the class attributes.
-        # We use a subclass temporarily to prevent these side effects from leaking.
-        class TestCharmEvents(CharmEvents):
-            pass
-        CharmBase.on = TestCharmEvents()
-
-        def cleanup():
-            shutil.rmtree(self.JUJU_CHARM_DIR)
-            CharmBase.on = CharmEvents()
-        self.addCleanup(cleanup)
+        self.addCleanup(shutil.rmtree, self.JUJU_CHARM_DIR)
 
     def _setup_charm_dir(self):
         self.JUJU_CHARM_DIR = Path(tempfile.mkdtemp()) / 'test_main'